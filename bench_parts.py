@@ -0,0 +1,31 @@
+"""Time the stages of the escape implementations separately, so a
+change in the end-to-end numbers from bench.py can be attributed to the
+scan, the fill, the tail split, or the Markup wrapper.
+"""
+
+import pyperf
+
+runner = pyperf.Runner()
+
+for name, s in (
+    ("short escape", '"<strong>Hello, World!</strong>"'),
+    ("long escape", '"Hello, World!" * 1000'),
+    ("long plain", '"Hello, World!" * 1000'),
+    ("long suffix", '"<strong>Hello, World!</strong>" + "x" * 100_000'),
+):
+    for stage, stmt in (
+        ("scan", "_UNSAFE_RE.search(s)"),
+        ("fill", "s.translate(_ESCAPE_TABLE)"),
+        ("tail split", 'max(map(s.rfind, "&<>\'\\""))'),
+        ("wrap", "Markup(s)"),
+    ):
+        runner.timeit(
+            f"{stage} {name}",
+            stmt,
+            setup=(
+                "from markupsafe import Markup\n"
+                "from markupsafe._native import _ESCAPE_TABLE\n"
+                "from markupsafe._native import _UNSAFE_RE\n"
+                f"s = {s}"
+            ),
+        )
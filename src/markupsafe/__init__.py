@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import html
 import string
 import typing as t
 
@@ -39,8 +40,18 @@ def escape(s: t.Any, /) -> Markup:
     if type(s) is str:
         return Markup(_escape_inner(s))
 
-    if hasattr(s, "__html__"):
-        return Markup(s.__html__())
+    # An exact Markup instance is already safe and would come back
+    # unchanged from its __html__ anyway; skip the call and the rewrap.
+    # Methods that escape their arguments benefit when templates pass
+    # pre-escaped fragments around.
+    if type(s) is Markup:
+        return s
+
+    # A single getattr avoids looking __html__ up again to call it.
+    html_func = getattr(s, "__html__", None)
+
+    if html_func is not None:
+        return Markup(html_func())
 
     return Markup(_escape_inner(str(s)))
 
@@ -122,8 +133,10 @@ class Markup(str):
     def __new__(
         cls, object: t.Any = "", encoding: str | None = None, errors: str = "strict"
     ) -> te.Self:
-        if hasattr(object, "__html__"):
-            object = object.__html__()
+        html_func = getattr(object, "__html__", None)
+
+        if html_func is not None:
+            object = html_func()
 
         if encoding is None:
             return super().__new__(cls, object)
@@ -152,15 +165,19 @@ class Markup(str):
         return self.__class__(super().__mul__(value))
 
     def __mod__(self, value: t.Any, /) -> te.Self:
+        escape = self.escape
+
         if isinstance(value, tuple):
             # a tuple of arguments, each wrapped
-            value = tuple(_MarkupEscapeHelper(x, self.escape) for x in value)
-        elif hasattr(type(value), "__getitem__") and not isinstance(value, str):
+            value = tuple(_MarkupEscapeHelper(x, escape) for x in value)
+        elif getattr(type(value), "__getitem__", None) is not None and not isinstance(
+            value, str
+        ):
             # a mapping of arguments, wrapped
-            value = _MarkupEscapeHelper(value, self.escape)
+            value = _MarkupEscapeHelper(value, escape)
         else:
             # a single argument, wrapped with the helper and a tuple
-            value = (_MarkupEscapeHelper(value, self.escape),)
+            value = (_MarkupEscapeHelper(value, escape),)
 
         return self.__class__(super().__mod__(value))
 
@@ -168,22 +185,31 @@ class Markup(str):
         return f"{self.__class__.__name__}({super().__repr__()})"
 
     def join(self, iterable: cabc.Iterable[str | _HasHTML], /) -> te.Self:
-        return self.__class__(super().join(map(self.escape, iterable)))
+        cls = self.__class__
+        values = list(iterable)
+
+        # Joining already-safe fragments is the common case in template
+        # engines; one type check per item is much cheaper than an
+        # escape call per item.
+        if all(type(v) is cls for v in values):
+            return cls(super().join(t.cast("list[str]", values)))
+
+        return cls(super().join(map(self.escape, values)))
 
     def split(  # type: ignore[override]
         self, /, sep: str | None = None, maxsplit: t.SupportsIndex = -1
     ) -> list[te.Self]:
-        return [self.__class__(v) for v in super().split(sep, maxsplit)]
+        return list(map(self.__class__, super().split(sep, maxsplit)))
 
     def rsplit(  # type: ignore[override]
         self, /, sep: str | None = None, maxsplit: t.SupportsIndex = -1
     ) -> list[te.Self]:
-        return [self.__class__(v) for v in super().rsplit(sep, maxsplit)]
+        return list(map(self.__class__, super().rsplit(sep, maxsplit)))
 
     def splitlines(  # type: ignore[override]
         self, /, keepends: bool = False
     ) -> list[te.Self]:
-        return [self.__class__(v) for v in super().splitlines(keepends)]
+        return list(map(self.__class__, super().splitlines(keepends)))
 
     def unescape(self, /) -> str:
         """Convert escaped markup back into a text string. This replaces
@@ -192,9 +218,14 @@ class Markup(str):
         >>> Markup("Main &raquo; <em>About</em>").unescape()
         'Main » <em>About</em>'
         """
-        from html import unescape
+        # Without any "&" there is no entity to replace, and
+        # html.unescape would hand its argument back unchanged; only
+        # the plain-str copy is needed. Passing self directly is not
+        # safe: the result must not remain a Markup instance.
+        if "&" not in self:
+            return str(self)
 
-        return unescape(str(self))
+        return html.unescape(str(self))
 
     def striptags(self, /) -> str:
         """:meth:`unescape` the markup, remove tags, and normalize
@@ -204,27 +235,34 @@ class Markup(str):
         'Main » About'
         """
         value = str(self)
-
-        # Look for comments then tags separately. Otherwise, a comment that
-        # contains a tag would end early, leaving some of the comment behind.
-
-        # keep finding comment start marks
-        while (start := value.find("<!--")) != -1:
-            # find a comment end mark beyond the start, otherwise stop
-            if (end := value.find("-->", start)) == -1:
+        parts = []
+        pos = 0
+
+        # Collect the text between markers in a single forward scan.
+        # Check for a comment start mark before a tag start, otherwise a
+        # comment that contains a tag would end early, leaving some of
+        # the comment behind. A comment start mark without an end mark
+        # is treated as a plain tag open instead, so tags after it are
+        # still removed. A tag open without a close is kept as text.
+        while (start := value.find("<", pos)) != -1:
+            if value.startswith("<!--", start) and (
+                end := value.find("-->", start)
+            ) != -1:
+                offset = 3
+            else:
+                end = value.find(">", start + 1)
+                offset = 1
+
+            if end == -1:
                 break
 
-            value = f"{value[:start]}{value[end + 3:]}"
+            parts.append(value[pos:start])
+            pos = end + offset
 
-        # remove tags using the same method
-        while (start := value.find("<")) != -1:
-            if (end := value.find(">", start)) == -1:
-                break
-
-            value = f"{value[:start]}{value[end + 1:]}"
+        parts.append(value[pos:])
 
         # collapse spaces
-        value = " ".join(value.split())
+        value = " ".join("".join(parts).split())
         return self.__class__(value).unescape()
 
     @classmethod
@@ -311,16 +349,16 @@ class Markup(str):
         return cls(left), cls(sep), cls(right)
 
     def format(self, *args: t.Any, **kwargs: t.Any) -> te.Self:
-        formatter = EscapeFormatter(self.escape)
-        return self.__class__(formatter.vformat(self, args, kwargs))
+        cls = self.__class__
+        return cls(_formatter_for(cls).vformat(self, args, kwargs))
 
     def format_map(
         self,
         mapping: cabc.Mapping[str, t.Any],  # type: ignore[override]
         /,
     ) -> te.Self:
-        formatter = EscapeFormatter(self.escape)
-        return self.__class__(formatter.vformat(self, (), mapping))
+        cls = self.__class__
+        return cls(_formatter_for(cls).vformat(self, (), mapping))
 
     def __html_format__(self, format_spec: str, /) -> te.Self:
         if format_spec:
@@ -337,16 +375,16 @@ class EscapeFormatter(string.Formatter):
         super().__init__()
 
     def format_field(self, value: t.Any, format_spec: str) -> str:
-        if hasattr(value, "__html_format__"):
-            rv = value.__html_format__(format_spec)
-        elif hasattr(value, "__html__"):
+        if (html_format := getattr(value, "__html_format__", None)) is not None:
+            rv = html_format(format_spec)
+        elif (html_func := getattr(value, "__html__", None)) is not None:
             if format_spec:
                 raise ValueError(
                     f"Format specifier {format_spec} given, but {type(value)} does not"
                     " define __html_format__. A class that defines __html__ must define"
                     " __html_format__ to work with format specifiers."
                 )
-            rv = value.__html__()
+            rv = html_func()
         else:
             # We need to make sure the format spec is str here as
             # otherwise the wrong callback methods are invoked.
@@ -354,20 +392,41 @@ class EscapeFormatter(string.Formatter):
         return str(self.escape(rv))
 
 
+def _formatter_for(cls: type[Markup]) -> EscapeFormatter:
+    """Get the :class:`EscapeFormatter` cached on a :class:`Markup`
+    class, creating it first if needed. Each class gets its own
+    formatter, rather than inheriting one, because the formatter must
+    use that class's bound ``escape``.
+    """
+    formatter: EscapeFormatter | None = cls.__dict__.get("_escape_formatter")
+
+    if formatter is None:
+        formatter = EscapeFormatter(cls.escape)
+        cls._escape_formatter = formatter  # type: ignore[attr-defined]
+
+    return formatter
+
+
 class _MarkupEscapeHelper:
     """Helper for :meth:`Markup.__mod__`."""
 
-    __slots__ = ("obj", "escape")
+    __slots__ = ("obj", "escape", "_str")
 
     def __init__(self, obj: t.Any, escape: _TPEscape) -> None:
         self.obj: t.Any = obj
         self.escape: _TPEscape = escape
+        self._str: str | None = None
 
     def __getitem__(self, key: t.Any, /) -> te.Self:
         return self.__class__(self.obj[key], self.escape)
 
     def __str__(self, /) -> str:
-        return str(self.escape(self.obj))
+        # The formatter may stringify the same wrapped value more than
+        # once; only escape it the first time.
+        if (rv := self._str) is None:
+            rv = self._str = str(self.escape(self.obj))
+
+        return rv
 
     def __repr__(self, /) -> str:
         return str(self.escape(repr(self.obj)))
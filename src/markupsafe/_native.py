@@ -1,8 +1,52 @@
+from __future__ import annotations
+
+import functools
+import re
+
+_UNSAFE_RE = re.compile(r"[&<>'\"]")
+_ESCAPE_TABLE = str.maketrans(
+    {
+        "&": "&amp;",
+        ">": "&gt;",
+        "<": "&lt;",
+        "'": "&#39;",
+        '"': "&#34;",
+    }
+)
+
+
+def _escape(s: str, /) -> str:
+    # Most strings passed to escape don't contain any of the characters
+    # being replaced. The scan is a single C-level pass that avoids
+    # allocating a copy in that case.
+    if _UNSAFE_RE.search(s) is None:
+        return s
+
+    # Everything after the last special character is clean and can be
+    # reused as-is instead of being scanned and copied by translate.
+    # Each rfind is a single reverse C-level scan.
+    stop = max(map(s.rfind, "&<>'\"")) + 1
+
+    if stop == len(s):
+        return s.translate(_ESCAPE_TABLE)
+
+    return s[:stop].translate(_ESCAPE_TABLE) + s[stop:]
+
+
+# Templates tend to escape the same short strings, such as attribute
+# values and class names, over and over; remember those results so
+# repeat calls become a cache hit.
+_escape_cached = functools.lru_cache(maxsize=1024)(_escape)
+
+
 def _escape_inner(s: str, /) -> str:
-    return (
-        s.replace("&", "&amp;")
-        .replace(">", "&gt;")
-        .replace("<", "&lt;")
-        .replace("'", "&#39;")
-        .replace('"', "&#34;")
-    )
+    # Only cache short strings so large documents don't crowd out the
+    # entries that actually repeat.
+    if len(s) <= 128:
+        return _escape_cached(s)
+
+    return _escape(s)
+
+
+def _escape_inner_many(seq: list[str] | tuple[str, ...], /) -> list[str]:
+    return [_escape_inner(s) for s in seq]
@@ -1,4 +1,13 @@
 #include <Python.h>
+#include <string.h>
+
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__))
+#define MARKUPSAFE_SIMD_X86 1
+#include <immintrin.h>
+#elif defined(__aarch64__) && defined(__ARM_NEON)
+#define MARKUPSAFE_SIMD_NEON 1
+#include <arm_neon.h>
+#endif
 
 #define GET_DELTA(inp, inp_end, delta) \
 	while (inp < inp_end) { \
@@ -71,29 +80,438 @@
 		memcpy(outp, inp-ncopy, sizeof(*outp)*ncopy); \
 	}
 
+static Py_ssize_t
+get_delta_ucs1_scalar(const Py_UCS1 *inp, const Py_UCS1 *inp_end)
+{
+	Py_ssize_t delta = 0;
+
+	GET_DELTA(inp, inp_end, delta);
+	return delta;
+}
+
+static void
+do_escape_ucs1_scalar(const Py_UCS1 *inp, const Py_UCS1 *inp_end, Py_UCS1 *outp,
+					  const Py_UCS1 *outp_end)
+{
+	(void)outp_end;
+	DO_ESCAPE(inp, inp_end, outp);
+}
+
+/* Every entity fits in eight zero-padded bytes, so emission is a
+   single unaligned 8-byte store plus a length lookup instead of a
+   five-way branch. */
+static const char ENTITY_BYTES[128][8] = {
+	['"'] = "&#34;",
+	['\''] = "&#39;",
+	['&'] = "&amp;",
+	['<'] = "&lt;",
+	['>'] = "&gt;",
+};
+static const unsigned char ENTITY_LEN[128] = {
+	['"'] = 5,
+	['\''] = 5,
+	['&'] = 5,
+	['<'] = 4,
+	['>'] = 4,
+};
+
+/* Write the entity for one of the five special characters and return
+   the advanced output pointer. Only called for those characters. The
+   output buffer is allocated to the exact result size, so the wide
+   store is only safe away from the end. */
+static inline Py_UCS1*
+write_entity_ucs1(Py_UCS1 *outp, const Py_UCS1 *outp_end, Py_UCS1 c)
+{
+	if (outp_end - outp >= 8)
+		memcpy(outp, ENTITY_BYTES[c], 8);
+	else
+		memcpy(outp, ENTITY_BYTES[c], ENTITY_LEN[c]);
+
+	return outp + ENTITY_LEN[c];
+}
+
+#ifdef MARKUPSAFE_SIMD_X86
+
+/* The two needle sets are kept separate so the size scan can weight
+   them: the entities for " ' & are five characters long (delta 4), the
+   ones for < > are four (delta 3). */
+#define SSE42_NEEDLE4 _mm_setr_epi8('"', '\'', '&', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+#define SSE42_NEEDLE3 _mm_setr_epi8('<', '>', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+#define SSE42_MODE (_SIDD_UBYTE_OPS | _SIDD_CMP_EQUAL_ANY | _SIDD_BIT_MASK)
+
+__attribute__((target("sse4.2,popcnt")))
+static Py_ssize_t
+get_delta_ucs1_sse42(const Py_UCS1 *inp, const Py_UCS1 *inp_end)
+{
+	Py_ssize_t delta = 0;
+
+	while (inp_end - inp >= 16) {
+		__m128i chunk = _mm_loadu_si128((const __m128i*)inp);
+		unsigned int mask4 = (unsigned int)_mm_cvtsi128_si32(
+			_mm_cmpestrm(SSE42_NEEDLE4, 3, chunk, 16, SSE42_MODE));
+		unsigned int mask3 = (unsigned int)_mm_cvtsi128_si32(
+			_mm_cmpestrm(SSE42_NEEDLE3, 2, chunk, 16, SSE42_MODE));
+
+		delta += 4 * __builtin_popcount(mask4);
+		delta += 3 * __builtin_popcount(mask3);
+		inp += 16;
+	}
+
+	return delta + get_delta_ucs1_scalar(inp, inp_end);
+}
+
+__attribute__((target("sse4.2,popcnt")))
+static void
+do_escape_ucs1_sse42(const Py_UCS1 *inp, const Py_UCS1 *inp_end, Py_UCS1 *outp,
+		  const Py_UCS1 *outp_end)
+{
+	while (inp_end - inp >= 16) {
+		__m128i chunk = _mm_loadu_si128((const __m128i*)inp);
+		unsigned int mask4 = (unsigned int)_mm_cvtsi128_si32(
+			_mm_cmpestrm(SSE42_NEEDLE4, 3, chunk, 16, SSE42_MODE));
+		unsigned int mask3 = (unsigned int)_mm_cvtsi128_si32(
+			_mm_cmpestrm(SSE42_NEEDLE3, 2, chunk, 16, SSE42_MODE));
+		unsigned int mask = mask4 | mask3;
+
+		if (mask == 0) {
+			memcpy(outp, inp, 16);
+			outp += 16;
+		}
+		else {
+			unsigned int prev = 0;
+
+			while (mask) {
+				unsigned int idx = (unsigned int)__builtin_ctz(mask);
+
+				memcpy(outp, inp + prev, idx - prev);
+				outp += idx - prev;
+				outp = write_entity_ucs1(outp, outp_end, inp[idx]);
+				prev = idx + 1;
+				mask &= mask - 1;
+			}
+
+			memcpy(outp, inp + prev, 16 - prev);
+			outp += 16 - prev;
+		}
+
+		inp += 16;
+	}
+
+	do_escape_ucs1_scalar(inp, inp_end, outp, outp_end);
+}
+
+/* Classify 32 bytes at once with two VPSHUFB table lookups, one on the
+   low nibble and one on the high nibble of each byte. A byte is one of
+   the five special characters iff the AND of the two lookups is
+   non-zero, and the surviving bit identifies which character class it
+   belongs to: bits 0-2 are " ' & (entity length 5, delta 4), bits 3-4
+   are < > (entity length 4, delta 3). Bytes >= 0x80 index the zeroed
+   upper half of the high-nibble table and never match. */
+
+#define AVX2_LO_TABLE _mm256_setr_epi8( \
+	0, 0, 0x01, 0, 0, 0, 0x02, 0x04, 0, 0, 0, 0, 0x08, 0, 0x10, 0, \
+	0, 0, 0x01, 0, 0, 0, 0x02, 0x04, 0, 0, 0, 0, 0x08, 0, 0x10, 0)
+#define AVX2_HI_TABLE _mm256_setr_epi8( \
+	0, 0, 0x07, 0x18, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, \
+	0, 0, 0x07, 0x18, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+__attribute__((target("avx2,popcnt")))
+static inline __m256i
+classify_avx2(__m256i chunk)
+{
+	__m256i lo = _mm256_shuffle_epi8(
+		AVX2_LO_TABLE, _mm256_and_si256(chunk, _mm256_set1_epi8(0x0F)));
+	__m256i hi = _mm256_shuffle_epi8(
+		AVX2_HI_TABLE,
+		_mm256_and_si256(_mm256_srli_epi16(chunk, 4), _mm256_set1_epi8(0x0F)));
+
+	return _mm256_and_si256(lo, hi);
+}
+
+__attribute__((target("avx2,popcnt")))
+static inline unsigned int
+class_mask_avx2(__m256i cls, char bits)
+{
+	__m256i hit = _mm256_cmpeq_epi8(
+		_mm256_and_si256(cls, _mm256_set1_epi8(bits)), _mm256_setzero_si256());
+
+	return ~(unsigned int)_mm256_movemask_epi8(hit);
+}
+
+__attribute__((target("avx2,popcnt")))
+static Py_ssize_t
+get_delta_ucs1_avx2(const Py_UCS1 *inp, const Py_UCS1 *inp_end)
+{
+	Py_ssize_t delta = 0;
+
+	while (inp_end - inp >= 32) {
+		__m256i cls = classify_avx2(_mm256_loadu_si256((const __m256i*)inp));
+
+		delta += 4 * __builtin_popcount(class_mask_avx2(cls, 0x07));
+		delta += 3 * __builtin_popcount(class_mask_avx2(cls, 0x18));
+		inp += 32;
+	}
+
+	return delta + get_delta_ucs1_scalar(inp, inp_end);
+}
+
+__attribute__((target("avx2,popcnt")))
+static void
+do_escape_ucs1_avx2(const Py_UCS1 *inp, const Py_UCS1 *inp_end, Py_UCS1 *outp,
+		  const Py_UCS1 *outp_end)
+{
+	while (inp_end - inp >= 32) {
+		__m256i cls = classify_avx2(_mm256_loadu_si256((const __m256i*)inp));
+		unsigned int mask = class_mask_avx2(cls, 0x1F);
+
+		if (mask == 0) {
+			memcpy(outp, inp, 32);
+			outp += 32;
+		}
+		else {
+			unsigned int prev = 0;
+
+			while (mask) {
+				unsigned int idx = (unsigned int)__builtin_ctz(mask);
+
+				memcpy(outp, inp + prev, idx - prev);
+				outp += idx - prev;
+				outp = write_entity_ucs1(outp, outp_end, inp[idx]);
+				prev = idx + 1;
+				mask &= mask - 1;
+			}
+
+			memcpy(outp, inp + prev, 32 - prev);
+			outp += 32 - prev;
+		}
+
+		inp += 32;
+	}
+
+	do_escape_ucs1_scalar(inp, inp_end, outp, outp_end);
+}
+
+/* With AVX-512BW the match masks come straight out of the byte
+   compares as 64-bit integers, so a 64-byte chunk needs no movemask or
+   classification tables at all. */
+
+__attribute__((target("avx512f,avx512bw,popcnt")))
+static inline __mmask64
+class_mask4_avx512(__m512i chunk)
+{
+	return _mm512_cmpeq_epi8_mask(chunk, _mm512_set1_epi8('"'))
+		| _mm512_cmpeq_epi8_mask(chunk, _mm512_set1_epi8('\''))
+		| _mm512_cmpeq_epi8_mask(chunk, _mm512_set1_epi8('&'));
+}
+
+__attribute__((target("avx512f,avx512bw,popcnt")))
+static inline __mmask64
+class_mask3_avx512(__m512i chunk)
+{
+	return _mm512_cmpeq_epi8_mask(chunk, _mm512_set1_epi8('<'))
+		| _mm512_cmpeq_epi8_mask(chunk, _mm512_set1_epi8('>'));
+}
+
+__attribute__((target("avx512f,avx512bw,popcnt")))
+static Py_ssize_t
+get_delta_ucs1_avx512(const Py_UCS1 *inp, const Py_UCS1 *inp_end)
+{
+	Py_ssize_t delta = 0;
+
+	while (inp_end - inp >= 64) {
+		__m512i chunk = _mm512_loadu_si512((const void*)inp);
+
+		delta += 4 * __builtin_popcountll(class_mask4_avx512(chunk));
+		delta += 3 * __builtin_popcountll(class_mask3_avx512(chunk));
+		inp += 64;
+	}
+
+	return delta + get_delta_ucs1_scalar(inp, inp_end);
+}
+
+__attribute__((target("avx512f,avx512bw,popcnt")))
+static void
+do_escape_ucs1_avx512(const Py_UCS1 *inp, const Py_UCS1 *inp_end, Py_UCS1 *outp,
+		  const Py_UCS1 *outp_end)
+{
+	while (inp_end - inp >= 64) {
+		__m512i chunk = _mm512_loadu_si512((const void*)inp);
+		unsigned long long mask =
+			class_mask4_avx512(chunk) | class_mask3_avx512(chunk);
+
+		if (mask == 0) {
+			memcpy(outp, inp, 64);
+			outp += 64;
+		}
+		else {
+			unsigned long long prev = 0;
+
+			while (mask) {
+				unsigned long long idx =
+					(unsigned long long)__builtin_ctzll(mask);
+
+				memcpy(outp, inp + prev, idx - prev);
+				outp += idx - prev;
+				outp = write_entity_ucs1(outp, outp_end, inp[idx]);
+				prev = idx + 1;
+				mask &= mask - 1;
+			}
+
+			memcpy(outp, inp + prev, 64 - prev);
+			outp += 64 - prev;
+		}
+
+		inp += 64;
+	}
+
+	do_escape_ucs1_scalar(inp, inp_end, outp, outp_end);
+}
+
+#endif  /* MARKUPSAFE_SIMD_X86 */
+
+#ifdef MARKUPSAFE_SIMD_NEON
+
+/* NEON is part of the aarch64 baseline, so unlike the x86 tiers these
+   need no runtime dispatch. */
+
+static inline uint8x16_t
+class_match4_neon(uint8x16_t chunk)
+{
+	return vorrq_u8(
+		vorrq_u8(
+			vceqq_u8(chunk, vdupq_n_u8('"')),
+			vceqq_u8(chunk, vdupq_n_u8('\''))),
+		vceqq_u8(chunk, vdupq_n_u8('&')));
+}
+
+static inline uint8x16_t
+class_match3_neon(uint8x16_t chunk)
+{
+	return vorrq_u8(
+		vceqq_u8(chunk, vdupq_n_u8('<')),
+		vceqq_u8(chunk, vdupq_n_u8('>')));
+}
+
+/* Collapse a byte-wise match vector into a 64-bit mask with one nibble
+   per byte, the cheap aarch64 substitute for movemask. */
+static inline uint64_t
+match_mask_neon(uint8x16_t match)
+{
+	return vget_lane_u64(
+		vreinterpret_u64_u8(vshrn_n_u16(vreinterpretq_u16_u8(match), 4)), 0);
+}
+
+static Py_ssize_t
+get_delta_ucs1_neon(const Py_UCS1 *inp, const Py_UCS1 *inp_end)
+{
+	Py_ssize_t delta = 0;
+
+	while (inp_end - inp >= 16) {
+		uint8x16_t chunk = vld1q_u8(inp);
+		uint8x16_t one = vdupq_n_u8(1);
+
+		delta += 4 * vaddvq_u8(vandq_u8(class_match4_neon(chunk), one));
+		delta += 3 * vaddvq_u8(vandq_u8(class_match3_neon(chunk), one));
+		inp += 16;
+	}
+
+	return delta + get_delta_ucs1_scalar(inp, inp_end);
+}
+
+static void
+do_escape_ucs1_neon(const Py_UCS1 *inp, const Py_UCS1 *inp_end, Py_UCS1 *outp,
+		  const Py_UCS1 *outp_end)
+{
+	while (inp_end - inp >= 16) {
+		uint8x16_t chunk = vld1q_u8(inp);
+		uint64_t mask = match_mask_neon(
+			vorrq_u8(class_match4_neon(chunk), class_match3_neon(chunk)));
+
+		if (mask == 0) {
+			memcpy(outp, inp, 16);
+			outp += 16;
+		}
+		else {
+			uint64_t prev = 0;
+
+			while (mask) {
+				/* each matched byte sets a whole nibble */
+				uint64_t idx = (uint64_t)__builtin_ctzll(mask) >> 2;
+
+				memcpy(outp, inp + prev, idx - prev);
+				outp += idx - prev;
+				outp = write_entity_ucs1(outp, outp_end, inp[idx]);
+				prev = idx + 1;
+				mask &= ~(0xFull << (idx * 4));
+			}
+
+			memcpy(outp, inp + prev, 16 - prev);
+			outp += 16 - prev;
+		}
+
+		inp += 16;
+	}
+
+	do_escape_ucs1_scalar(inp, inp_end, outp, outp_end);
+}
+
+#endif  /* MARKUPSAFE_SIMD_NEON */
+
+/* The UCS1 scan entry points, resolved once at module init to the best
+   implementation the CPU supports. */
+#ifdef MARKUPSAFE_SIMD_NEON
+static Py_ssize_t (*get_delta_ucs1)(const Py_UCS1*, const Py_UCS1*) =
+	get_delta_ucs1_neon;
+static void (*do_escape_ucs1)(const Py_UCS1*, const Py_UCS1*, Py_UCS1*,
+							   const Py_UCS1*) = do_escape_ucs1_neon;
+#else
+static Py_ssize_t (*get_delta_ucs1)(const Py_UCS1*, const Py_UCS1*) =
+	get_delta_ucs1_scalar;
+static void (*do_escape_ucs1)(const Py_UCS1*, const Py_UCS1*, Py_UCS1*,
+							   const Py_UCS1*) = do_escape_ucs1_scalar;
+#endif
+
+static void
+init_ucs1_dispatch(void)
+{
+#ifdef MARKUPSAFE_SIMD_X86
+	if (__builtin_cpu_supports("avx512bw")) {
+		get_delta_ucs1 = get_delta_ucs1_avx512;
+		do_escape_ucs1 = do_escape_ucs1_avx512;
+	}
+	else if (__builtin_cpu_supports("avx2")) {
+		get_delta_ucs1 = get_delta_ucs1_avx2;
+		do_escape_ucs1 = do_escape_ucs1_avx2;
+	}
+	else if (__builtin_cpu_supports("sse4.2")) {
+		get_delta_ucs1 = get_delta_ucs1_sse42;
+		do_escape_ucs1 = do_escape_ucs1_sse42;
+	}
+#endif
+}
+
 static PyObject*
-escape_unicode_kind1(PyUnicodeObject *in)
+escape_unicode_kind1(PyUnicodeObject *in, Py_UCS4 maxchar)
 {
-	Py_UCS1 *inp = PyUnicode_1BYTE_DATA(in);
-	Py_UCS1 *inp_end = inp + PyUnicode_GET_LENGTH(in);
+	const Py_UCS1 *inp = PyUnicode_1BYTE_DATA(in);
+	const Py_UCS1 *inp_end = inp + PyUnicode_GET_LENGTH(in);
 	Py_UCS1 *outp;
 	PyObject *out;
-	Py_ssize_t delta = 0;
+	Py_ssize_t delta;
 
-	GET_DELTA(inp, inp_end, delta);
+	delta = get_delta_ucs1(inp, inp_end);
 	if (!delta) {
 		Py_INCREF(in);
 		return (PyObject*)in;
 	}
 
-	out = PyUnicode_New(PyUnicode_GET_LENGTH(in) + delta,
-						PyUnicode_IS_ASCII(in) ? 127 : 255);
+	out = PyUnicode_New(PyUnicode_GET_LENGTH(in) + delta, maxchar);
 	if (!out)
 		return NULL;
 
-	inp = PyUnicode_1BYTE_DATA(in);
 	outp = PyUnicode_1BYTE_DATA(out);
-	DO_ESCAPE(inp, inp_end, outp);
+	do_escape_ucs1(inp, inp_end, outp,
+				   outp + PyUnicode_GET_LENGTH(in) + delta);
 	return out;
 }
 
@@ -158,9 +576,15 @@ escape_unicode(PyObject *self, PyObject *s)
 	if (PyUnicode_READY(s))
 		return NULL;
 
+	/* ASCII is the overwhelmingly common case for template text; it is
+	   a flag-bit read, skips the kind switch, and the result maxchar is
+	   known without looking at the data. */
+	if (PyUnicode_IS_ASCII(s))
+		return escape_unicode_kind1((PyUnicodeObject*) s, 127);
+
 	switch (PyUnicode_KIND(s)) {
 	case PyUnicode_1BYTE_KIND:
-		return escape_unicode_kind1((PyUnicodeObject*) s);
+		return escape_unicode_kind1((PyUnicodeObject*) s, 255);
 	case PyUnicode_2BYTE_KIND:
 		return escape_unicode_kind2((PyUnicodeObject*) s);
 	case PyUnicode_4BYTE_KIND:
@@ -170,8 +594,67 @@ escape_unicode(PyObject *self, PyObject *s)
 	return NULL;
 }
 
+static PyObject*
+escape_unicode_many(PyObject *self, PyObject *seq)
+{
+	PyObject *out;
+	Py_ssize_t len, i;
+	int is_list = PyList_Check(seq);
+
+	if (!is_list && !PyTuple_Check(seq)) {
+		PyErr_SetString(PyExc_TypeError, "expected a list or tuple of str");
+		return NULL;
+	}
+
+	len = is_list ? PyList_GET_SIZE(seq) : PyTuple_GET_SIZE(seq);
+	out = PyList_New(len);
+	if (!out)
+		return NULL;
+
+	for (i = 0; i < len; i++) {
+		PyObject *item;
+		PyObject *escaped;
+
+		if (is_list) {
+#ifdef Py_GIL_DISABLED
+			/* Free-threaded builds must hold a strong reference;
+			   another thread may mutate the list while escape runs. */
+			item = PyList_GetItemRef(seq, i);
+			if (!item) {
+				Py_DECREF(out);
+				return NULL;
+			}
+#else
+			item = PyList_GET_ITEM(seq, i);
+			Py_INCREF(item);
+#endif
+		}
+		else {
+			item = PyTuple_GET_ITEM(seq, i);
+			Py_INCREF(item);
+		}
+
+		escaped = escape_unicode(self, item);
+		Py_DECREF(item);
+
+		if (!escaped) {
+			if (!PyErr_Occurred())
+				PyErr_SetString(PyExc_TypeError,
+								"expected a list or tuple of str");
+
+			Py_DECREF(out);
+			return NULL;
+		}
+
+		PyList_SET_ITEM(out, i, escaped);
+	}
+
+	return out;
+}
+
 static PyMethodDef module_methods[] = {
 	{"_escape_inner", (PyCFunction)escape_unicode, METH_O, NULL},
+	{"_escape_inner_many", (PyCFunction)escape_unicode_many, METH_O, NULL},
 	{NULL, NULL, 0, NULL}  /* Sentinel */
 };
 
@@ -200,5 +683,7 @@ PyInit__speedups(void)
 	PyUnstable_Module_SetGIL(m, Py_MOD_GIL_NOT_USED);
 	#endif
 
+	init_ucs1_dispatch();
+
 	return m;
 }
@@ -1 +1,2 @@
 def _escape_inner(s: str, /) -> str: ...
+def _escape_inner_many(seq: list[str] | tuple[str, ...], /) -> list[str]: ...
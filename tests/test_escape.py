@@ -34,6 +34,41 @@ def test_escape(value: str, expect: str) -> None:
     assert escape(value) == Markup(expect)
 
 
+@pytest.mark.parametrize("length", [15, 16, 17, 31, 32, 33, 63, 64, 65, 128, 1000])
+def test_escape_long(length: int) -> None:
+    """Exercise the chunked scan in the C implementation with special
+    characters at every position, including chunk boundaries and tails.
+    """
+    for i in range(length):
+        value = "x" * i + "<" + "y" * (length - i - 1)
+        expect = "x" * i + "&lt;" + "y" * (length - i - 1)
+        assert escape(value) == Markup(expect)
+
+    assert escape("x" * length) == Markup("x" * length)
+    assert escape("&><'\"" * length) == Markup("&amp;&gt;&lt;&#39;&#34;" * length)
+
+
+def test_escape_inner_many() -> None:
+    """Both implementations provide a batch entry point that escapes a
+    list of strings in one call.
+    """
+    from markupsafe import _native
+
+    values = ["", "abcd", "a&b", "<p>"]
+    expect = ["", "abcd", "a&amp;b", "&lt;p&gt;"]
+    assert _native._escape_inner_many(values) == expect
+
+    speedups = pytest.importorskip("markupsafe._speedups")
+    assert speedups._escape_inner_many(values) == expect
+    assert speedups._escape_inner_many(tuple(values)) == expect
+
+    with pytest.raises(TypeError):
+        speedups._escape_inner_many([42])
+
+    with pytest.raises(TypeError):
+        speedups._escape_inner_many("<p>")
+
+
 class Proxy:
     def __init__(self, value: t.Any) -> None:
         self.__value = value
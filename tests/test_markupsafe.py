@@ -89,6 +89,17 @@ def test_escaping() -> None:
     )
 
 
+def test_striptags_unclosed() -> None:
+    # A comment start mark without an end mark is treated as a tag
+    # open, so complete tags after it are still removed.
+    assert Markup("b <!--b <em>  ").striptags() == "b"
+    # A tag open without a close is kept as text.
+    assert Markup("a <em b").striptags() == "a <em b"
+    assert Markup("a <!-- b").striptags() == "a <!-- b"
+    # An end mark that overlaps the start mark closes the comment.
+    assert Markup("a<!-->b").striptags() == "ab"
+
+
 def test_unescape() -> None:
     assert Markup("&lt;test&gt;").unescape() == "<test>"
 